@@ -1,8 +1,25 @@
-from pydantic_settings import BaseSettings
+from pydantic import computed_field
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
 
+# Dimensions of the supported OpenAI embedding models; deriving
+# embedding_dim from this keeps it from ever disagreeing with
+# embedding_model (a mismatch silently breaks the Qdrant collection)
+_EMBEDDING_DIMS = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536,
+}
+
 
 class Settings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore",
+        case_sensitive=False,
+    )
+
     # Groq (Free LLM)
     groq_api_key: str = ""
 
@@ -16,7 +33,6 @@ class Settings(BaseSettings):
 
     # Embedding settings (OpenAI)
     embedding_model: str = "text-embedding-3-small"  # Fast, high quality
-    embedding_dim: int = 1536
 
     # LLM settings
     llm_provider: str = "openai"  # "openai" or "groq"
@@ -26,9 +42,13 @@ class Settings(BaseSettings):
     app_version: str = "2.0.0"
     debug: bool = False
 
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
+    # CORS (restrict to the frontend origin in production)
+    cors_origins: list[str] = ["*"]
+
+    @computed_field
+    @property
+    def embedding_dim(self) -> int:
+        return _EMBEDDING_DIMS.get(self.embedding_model, 1536)
 
 
 @lru_cache()
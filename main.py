@@ -1,9 +1,15 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from contextlib import asynccontextmanager
+import asyncio
 import logging
 
 from config import get_settings
 from routes import health, ask
+from services.analytics import FLUSH_INTERVAL_SECONDS, flush_analytics, flush_wanted
+from services.embeddings import get_openai_client
+from services.retrieval import ensure_collection_exists, get_qdrant_client
 # from routes import ingest  # Disabled for security - not needed in production
 
 # Configure logging
@@ -15,6 +21,43 @@ logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
+
+async def _analytics_flusher():
+    """Periodically persist in-memory analytics counters to Qdrant.
+
+    Runs on the flush interval, but wakes early when the trackers signal
+    that the pending buffer is getting large.
+    """
+    while True:
+        await asyncio.to_thread(flush_wanted.wait, FLUSH_INTERVAL_SECONDS)
+        flush_wanted.clear()
+        await asyncio.to_thread(flush_analytics)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run startup/shutdown logic around the app's lifetime."""
+    logger.info(f"Starting ERSE API v{settings.app_version}")
+    # Qdrant setup is blocking; run it off the event loop so uvicorn
+    # can overlap it with the rest of its startup work. A failure here
+    # must not abort startup - the first request retries and /health
+    # reports the connection state.
+    try:
+        await asyncio.to_thread(ensure_collection_exists)
+    except Exception as e:
+        logger.warning(f"Could not reach Qdrant during startup: {e}")
+    # Warm the client singletons so the first /ask doesn't pay for
+    # client construction and TLS handshakes.
+    app.state.qdrant = get_qdrant_client()
+    app.state.embeddings = get_openai_client()
+    flusher = asyncio.create_task(_analytics_flusher())
+    logger.info("ERSE API started successfully")
+    yield
+    # Persist whatever analytics are still buffered before exiting
+    flusher.cancel()
+    await asyncio.to_thread(flush_analytics)
+
+
 # Create FastAPI app
 app = FastAPI(
     title="ERSE API",
@@ -22,15 +65,19 @@ app = FastAPI(
     version=settings.app_version,
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Allow all origins for demo
-    allow_credentials=True,
+    allow_origins=settings.cors_origins,
+    # Credentials can't be combined with a wildcard origin
+    allow_credentials="*" not in settings.cors_origins,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,  # Let browsers cache preflight responses for 24h
 )
 
 # Include routers
@@ -39,16 +86,8 @@ app.include_router(ask.router, tags=["Ask"])
 # app.include_router(ingest.router, tags=["Ingest"])  # Disabled for security
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize services on startup."""
-    logger.info(f"Starting ERSE API v{settings.app_version}")
-    logger.info("ERSE API started successfully")
-    # Qdrant and embedding model will load lazily on first request
-
-
 @app.get("/")
-async def root():
+def root():
     """Root endpoint."""
     return {
         "name": "ERSE API",
@@ -59,5 +98,17 @@ async def root():
 
 
 if __name__ == "__main__":
+    import os
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        # Default to one worker: the analytics flusher assumes a single
+        # writer per deployment (matching the Procfile's gunicorn -w 1);
+        # raise WEB_CONCURRENCY only if that race is resolved
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        loop="uvloop",
+        http="httptools",
+        log_level="info",
+    )
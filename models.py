@@ -1,11 +1,11 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator
+from typing import Literal, Optional
 from enum import Enum
 
 
 class RegulationType(str, Enum):
     GDPR = "gdpr"
-    AI_ACT = "ai_act"
+    AI_ACT = "aiact"
     DSA = "dsa"
     NIS2 = "nis2"
 
@@ -21,10 +21,22 @@ class Citation(BaseModel):
 
 class AskRequest(BaseModel):
     question: str = Field(..., min_length=3, max_length=2000)
-    regulations: list[str] = Field(default_factory=list)
+    regulations: set[RegulationType] = Field(default_factory=set)
     k: int = Field(default=5, ge=1, le=20)
     language: str = Field(default="en")
-    mode: str = Field(default="detailed")  # "short" or "detailed"
+    mode: Literal["short", "detailed"] = "detailed"
+
+    @field_validator("regulations", mode="before")
+    @classmethod
+    def _lowercase_regulations(cls, v):
+        # Accept any casing from clients; the enum values are lowercase
+        if isinstance(v, (list, set, tuple)):
+            return [r.lower() if isinstance(r, str) else r for r in v]
+        return v
+
+
+class AskBatchRequest(BaseModel):
+    questions: list[AskRequest] = Field(..., min_length=1, max_length=32)
 
 
 class AskResponse(BaseModel):
@@ -1,31 +1,91 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi.responses import StreamingResponse
+import asyncio
 import logging
+import threading
+import time
+from collections import OrderedDict
 
-from models import AskRequest, AskResponse, Citation
-from services.retrieval import search_regulations
-from services.synthesis import synthesize_answer
+from models import AskBatchRequest, AskRequest, AskResponse, Citation, RegulationType
+from services.retrieval import embed_query_batch, search_regulations
+from services.synthesis import synthesize_answer, synthesize_answer_stream
 from services.analytics import track_query, track_feedback, get_analytics_summary
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Memoized answers for identical questions (bounded LRU with TTL so
+# repeated demo/FAQ traffic skips the embedding, Qdrant and LLM calls)
+_ANSWER_CACHE_MAX = 512
+_ANSWER_CACHE_TTL_SECONDS = 3600.0
+_answer_cache: OrderedDict = OrderedDict()
+_answer_cache_lock = threading.Lock()
 
-@router.post("/ask", response_model=AskResponse)
-async def ask_question(request: AskRequest):
-    """Ask a question about EU regulations.
 
-    - AI Act selected: Returns AI-synthesized answer with interpretation
-    - Other regulations: Returns raw regulatory text without AI interpretation
-    """
+def _cache_get(key: tuple) -> AskResponse | None:
+    """Return a cached response if present and fresh, else None."""
+    with _answer_cache_lock:
+        entry = _answer_cache.get(key)
+        if entry is None:
+            return None
+        ts, response = entry
+        if time.monotonic() - ts >= _ANSWER_CACHE_TTL_SECONDS:
+            del _answer_cache[key]
+            return None
+        _answer_cache.move_to_end(key)
+        return response
+
+
+def _cache_put(key: tuple, response: AskResponse):
+    """Store a response, evicting the least recently used entries."""
+    with _answer_cache_lock:
+        _answer_cache[key] = (time.monotonic(), response)
+        _answer_cache.move_to_end(key)
+        while len(_answer_cache) > _ANSWER_CACHE_MAX:
+            _answer_cache.popitem(last=False)
+
+
+async def _answer_question(
+    request: AskRequest,
+    background_tasks: BackgroundTasks,
+    query_vector: tuple | None = None,
+) -> AskResponse:
+    """Answer one question; shared by /ask and /ask/batch."""
+
+    # Canonical lowercase regulation values (validated and deduplicated
+    # by the request model)
+    regs_lower = {r.value for r in request.regulations}
 
     # Check if AI Act is selected (enables AI synthesis mode)
-    use_ai_synthesis = "aiact" in [r.lower() for r in request.regulations]
+    use_ai_synthesis = RegulationType.AI_ACT in request.regulations
+
+    # Serve repeated questions from the in-process cache
+    cache_key = (
+        request.question.strip(),
+        tuple(sorted(regs_lower)),
+        request.k,
+        request.language,
+        request.mode,
+    )
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        # Still count the query in analytics
+        background_tasks.add_task(
+            track_query,
+            question=request.question,
+            regulations=sorted(regs_lower),
+            language=request.language,
+            confidence=cached.confidence,
+        )
+        return cached.model_copy(deep=True)
 
-    # Search for relevant chunks
-    chunks = search_regulations(
+    # Search for relevant chunks (blocking I/O - run off the event loop)
+    chunks = await asyncio.to_thread(
+        search_regulations,
         query=request.question,
-        regulations=request.regulations,
+        regulations=regs_lower,
         k=request.k,
+        query_vector=query_vector,
     )
 
     if not chunks:
@@ -38,68 +98,177 @@ async def ask_question(request: AskRequest):
 
     # AI Act selected → Use LLM to synthesize answer
     if use_ai_synthesis:
-        answer, citations, confidence = synthesize_answer(
+        answer, citations, confidence = await asyncio.to_thread(
+            synthesize_answer,
             question=request.question,
             chunks=chunks,
             language=request.language,
             mode=request.mode,
         )
+        # Build sources for backwards compatibility
+        sources = [
+            {
+                "source_ref": c.url,
+                "article_no": c.article,
+                "source_type": c.regulation,
+            }
+            for c in citations
+        ]
     else:
         # Other regulations → Return raw regulatory text (no AI interpretation)
+        # One pass over chunks builds citations, answer text and the
+        # confidence numerator together.
         citations = []
+        answer_parts = []
+        sources = []
+        score_sum = 0.0
         for chunk in chunks:
+            reg_upper = chunk["regulation"].upper()
+            article_no = chunk.get("article_no")
+            article_str = str(chunk.get("article_no", "N/A"))
+            url = chunk.get("url", "")
+            score = chunk.get("score", 0.0)
+            score_sum += score
             citations.append(Citation(
-                regulation=chunk["regulation"].upper(),
-                article=str(chunk.get("article_no", "N/A")),
+                regulation=reg_upper,
+                article=article_str,
                 title=chunk.get("title", ""),
                 excerpt=chunk["content"],
-                url=chunk.get("url", ""),
-                relevance_score=chunk.get("score", 0.0),
+                url=url,
+                relevance_score=score,
             ))
-
-        # Build answer from raw regulatory text
-        answer_parts = []
-        for chunk in chunks:
-            article_info = f"Article {chunk.get('article_no')}" if chunk.get('article_no') else "Section"
+            article_info = f"Article {article_no}" if article_no else "Section"
             answer_parts.append(
-                f"**{chunk['regulation'].upper()} - {article_info}**\n\n{chunk['content']}"
+                f"**{reg_upper} - {article_info}**\n\n{chunk['content']}"
             )
+            # Sources for backwards compatibility, straight from the chunk
+            sources.append({
+                "source_ref": url,
+                "article_no": article_str,
+                "source_type": reg_upper,
+            })
         answer = "\n\n---\n\n".join(answer_parts)
 
         # Calculate confidence from relevance scores
-        avg_score = sum(c.relevance_score for c in citations) / len(citations) if citations else 0
+        avg_score = score_sum / len(citations) if citations else 0
         confidence = min(avg_score, 1.0)
 
-    # Build sources for backwards compatibility
-    sources = [
-        {
-            "source_ref": c.url,
-            "article_no": c.article,
-            "source_type": c.regulation,
-        }
-        for c in citations
-    ]
-
-    # Track analytics
-    track_query(
+    # Track analytics after the response is sent (off the critical path)
+    background_tasks.add_task(
+        track_query,
         question=request.question,
-        regulations=request.regulations,
+        regulations=sorted(regs_lower),
         language=request.language,
         confidence=confidence,
     )
 
-    return AskResponse(
+    response = AskResponse(
         answer=answer,
         citations=citations,
         confidence=confidence,
         sources=sources,
     )
+    # Same guard as the synthesis cache: don't memoize error/zero-
+    # confidence answers, or a transient LLM failure would be served
+    # for the full cache TTL
+    if confidence > 0.05:
+        _cache_put(cache_key, response)
+    return response
+
+
+@router.post("/ask", response_model=AskResponse)
+async def ask_question(request: AskRequest, background_tasks: BackgroundTasks):
+    """Ask a question about EU regulations.
+
+    - AI Act selected: Returns AI-synthesized answer with interpretation
+    - Other regulations: Returns raw regulatory text without AI interpretation
+    """
+    return await _answer_question(request, background_tasks)
+
+
+@router.post("/ask/stream")
+async def ask_question_stream(request: AskRequest, background_tasks: BackgroundTasks):
+    """Stream the answer text as it is generated.
+
+    Tokens arrive as plain text while the LLM is still writing, so the
+    frontend can render immediately; citations and confidence are only
+    available from /ask.
+
+    Same rule as /ask: only AI Act requests get LLM synthesis; other
+    regulations stream the raw regulatory text without interpretation.
+    """
+    regs_lower = {r.value for r in request.regulations}
+    use_ai_synthesis = RegulationType.AI_ACT in request.regulations
+
+    chunks = await asyncio.to_thread(
+        search_regulations,
+        query=request.question,
+        regulations=regs_lower,
+        k=request.k,
+    )
+
+    background_tasks.add_task(
+        track_query,
+        question=request.question,
+        regulations=sorted(regs_lower),
+        language=request.language,
+        confidence=0.0,
+    )
+
+    if not chunks:
+        return StreamingResponse(
+            iter(["No relevant regulatory sources found. Please try rephrasing your question."]),
+            media_type="text/plain",
+        )
+
+    if not use_ai_synthesis:
+        # No AI interpretation without AI Act selected - emit the same
+        # raw-text answer /ask builds, in one piece
+        answer_parts = []
+        for chunk in chunks:
+            article_no = chunk.get("article_no")
+            article_info = f"Article {article_no}" if article_no else "Section"
+            answer_parts.append(
+                f"**{chunk['regulation'].upper()} - {article_info}**\n\n{chunk['content']}"
+            )
+        return StreamingResponse(
+            iter(["\n\n---\n\n".join(answer_parts)]),
+            media_type="text/plain",
+        )
+
+    # Sync generator: Starlette iterates it in a threadpool, so the
+    # blocking stream doesn't hold up the event loop
+    return StreamingResponse(
+        synthesize_answer_stream(
+            request.question, chunks, request.language, request.mode
+        ),
+        media_type="text/plain",
+    )
+
+
+@router.post("/ask/batch", response_model=list[AskResponse])
+async def ask_questions_batch(request: AskBatchRequest, background_tasks: BackgroundTasks):
+    """Answer up to 32 questions in one call.
+
+    All questions share a single embedding API call, then retrieval and
+    synthesis run concurrently per question.
+    """
+    vectors = await asyncio.to_thread(
+        embed_query_batch, [q.question for q in request.questions]
+    )
+    responses = await asyncio.gather(*[
+        _answer_question(q, background_tasks, query_vector=vectors.get(q.question))
+        for q in request.questions
+    ])
+    return list(responses)
 
 
 @router.get("/analytics")
 async def get_analytics():
     """Get usage analytics summary."""
-    return get_analytics_summary()
+    # The summary flushes pending counters to Qdrant first (blocking
+    # I/O), so keep it off the event loop like the other routes
+    return await asyncio.to_thread(get_analytics_summary)
 
 
 @router.post("/feedback")
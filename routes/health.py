@@ -1,4 +1,5 @@
 from fastapi import APIRouter
+import asyncio
 
 from config import get_settings
 from models import HealthResponse
@@ -11,7 +12,8 @@ settings = get_settings()
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
     """Check system health."""
-    qdrant_status = "connected" if check_qdrant_connection() else "disconnected"
+    qdrant_ok = await asyncio.to_thread(check_qdrant_connection)
+    qdrant_status = "connected" if qdrant_ok else "disconnected"
 
     return HealthResponse(
         status="healthy",
@@ -1,18 +1,14 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks
+import asyncio
 import logging
 
 from models import IngestRequest, IngestResponse
-from services.ingestion import (
-    ingest_document,
-    ingest_from_url,
-    ingest_gdpr_batch,
-    ingest_dsa_batch,
-    ingest_nis2_batch,
-    ingest_aiact_batch,
-)
-from services.retrieval import get_qdrant_client
 from config import get_settings
 
+# services.ingestion (and the scraping stack it pulls in) is imported
+# lazily inside each handler so merely importing this module - e.g. when
+# the router is disabled in main.py - stays cheap.
+
 router = APIRouter()
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -21,11 +17,13 @@ settings = get_settings()
 @router.post("/ingest", response_model=IngestResponse)
 async def ingest_regulation(request: IngestRequest):
     """Ingest a regulation document or article."""
+    from services.ingestion import ingest_document, ingest_from_url
 
     try:
         if request.content:
-            # Direct content ingestion
-            chunks_created = ingest_document(
+            # Direct content ingestion (blocking I/O - run off the event loop)
+            chunks_created = await asyncio.to_thread(
+                ingest_document,
                 regulation=request.regulation.value,
                 content=request.content,
                 article_no=request.article_no,
@@ -34,7 +32,8 @@ async def ingest_regulation(request: IngestRequest):
             )
         else:
             # Scrape from URL
-            chunks_created = ingest_from_url(
+            chunks_created = await asyncio.to_thread(
+                ingest_from_url,
                 regulation=request.regulation.value,
                 url=request.url,
                 article_no=request.article_no,
@@ -64,6 +63,7 @@ async def ingest_gdpr_articles(
     articles: list[int] = None,
 ):
     """Ingest multiple GDPR articles in the background."""
+    from services.ingestion import ingest_gdpr_batch
 
     if articles is None:
         articles = list(range(1, 100))
@@ -81,6 +81,7 @@ async def ingest_gdpr_articles(
 @router.post("/ingest/dsa-batch", response_model=IngestResponse)
 async def ingest_dsa_articles(background_tasks: BackgroundTasks):
     """Ingest Digital Services Act (DSA) in the background."""
+    from services.ingestion import ingest_dsa_batch
 
     background_tasks.add_task(ingest_dsa_batch)
 
@@ -94,6 +95,7 @@ async def ingest_dsa_articles(background_tasks: BackgroundTasks):
 @router.post("/ingest/nis2-batch", response_model=IngestResponse)
 async def ingest_nis2_articles(background_tasks: BackgroundTasks):
     """Ingest NIS2 Directive in the background."""
+    from services.ingestion import ingest_nis2_batch
 
     background_tasks.add_task(ingest_nis2_batch)
 
@@ -107,6 +109,7 @@ async def ingest_nis2_articles(background_tasks: BackgroundTasks):
 @router.post("/ingest/aiact-batch", response_model=IngestResponse)
 async def ingest_aiact_articles(background_tasks: BackgroundTasks):
     """Ingest AI Act in the background."""
+    from services.ingestion import ingest_aiact_batch
 
     background_tasks.add_task(ingest_aiact_batch)
 
@@ -121,6 +124,7 @@ async def ingest_aiact_articles(background_tasks: BackgroundTasks):
 async def delete_regulation_data(regulation: str):
     """Delete all data for a specific regulation."""
     from qdrant_client.models import Filter, FieldCondition, MatchValue
+    from services.retrieval import get_qdrant_client
 
     try:
         client = get_qdrant_client()
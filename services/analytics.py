@@ -1,11 +1,19 @@
-"""Analytics service for ERSE - stores data in Qdrant Cloud for persistence."""
-import json
+"""Analytics service for ERSE - stores data in Qdrant Cloud for persistence.
+
+Tracking calls only update in-process counters; a periodic flush (driven
+from the app lifespan) merges them into Qdrant, so the hot path never
+does network I/O.
+"""
 import logging
-from datetime import datetime, timedelta
+import threading
+import time
+from operator import itemgetter
+from collections import Counter, deque
+from datetime import date, datetime, timedelta
 from typing import Optional
 
 from qdrant_client import QdrantClient
-from qdrant_client.models import PointStruct, VectorParams, Distance
+from qdrant_client.models import PointStruct, VectorParams, Distance, HnswConfigDiff
 
 from config import get_settings
 
@@ -16,8 +24,66 @@ logger = logging.getLogger(__name__)
 ANALYTICS_COLLECTION = "erse_analytics"
 ANALYTICS_POINT_ID = 1  # Single point to store all analytics
 
+# How often the background flusher should persist pending counters
+FLUSH_INTERVAL_SECONDS = 10.0
+
+# Wake the flusher early once this many queries are buffered
+MAX_PENDING_QUERIES = 200
+
+# Set by the trackers when the buffer is getting large; the flusher
+# waits on this with FLUSH_INTERVAL_SECONDS as its timeout
+flush_wanted = threading.Event()
+
 _client: Optional[QdrantClient] = None
 
+_pending_lock = threading.Lock()
+
+
+def _new_pending() -> dict:
+    """Return an empty pending-counters buffer."""
+    return {
+        "total_queries": 0,
+        "queries_by_regulation": Counter(),
+        "queries_by_language": Counter(),
+        "queries_by_date": Counter(),
+        "recent_questions": deque(maxlen=100),
+        "feedback_positive": 0,
+        "feedback_negative": 0,
+    }
+
+
+_pending = _new_pending()
+
+# Lowercased forms of the small fixed set of regulation names, so the
+# hot path doesn't allocate a new string per event
+_LOWER_CACHE: dict = {}
+
+
+def _fast_lower(s: str) -> str:
+    v = _LOWER_CACHE.get(s)
+    if v is None:
+        v = _LOWER_CACHE.setdefault(s, s.lower())
+    return v
+
+
+# Cached day key so the hot path doesn't re-run strftime per event
+_today_cache = {"date": None, "str": ""}
+
+
+def _today_str() -> str:
+    """Return today's YYYY-MM-DD, recomputed only when the day changes."""
+    today = date.today()
+    if _today_cache["date"] != today:
+        _today_cache["date"] = today
+        _today_cache["str"] = today.isoformat()
+    return _today_cache["str"]
+
+
+# Short TTL cache over the persisted analytics payload so repeated reads
+# (e.g. dashboard polling) don't refetch from Qdrant every time
+_LOAD_CACHE_TTL_SECONDS = 5.0
+_load_cache = {"t": 0.0, "data": None}
+
 
 def _get_client() -> QdrantClient:
     """Get or create Qdrant client."""
@@ -27,6 +93,7 @@ def _get_client() -> QdrantClient:
             _client = QdrantClient(
                 url=settings.qdrant_url,
                 api_key=settings.qdrant_api_key,
+                prefer_grpc=True,
             )
         else:
             _client = QdrantClient(":memory:")
@@ -34,23 +101,66 @@ def _get_client() -> QdrantClient:
     return _client
 
 
+# Set once the collection is known to exist with the right vector
+# config, so the load/save paths skip the checks afterwards
+_collection_ready = False
+
+
+def _create_analytics_collection(client: QdrantClient):
+    """Create the payload-only analytics collection.
+
+    1-dim on-disk vector and m=0 so Qdrant never builds an HNSW graph
+    for it.
+    """
+    client.create_collection(
+        collection_name=ANALYTICS_COLLECTION,
+        vectors_config=VectorParams(size=1, distance=Distance.DOT, on_disk=True),
+        hnsw_config=HnswConfigDiff(m=0),
+    )
+
+
 def _ensure_analytics_collection():
-    """Create analytics collection if it doesn't exist."""
+    """Create (or migrate) the analytics collection if needed."""
+    global _collection_ready
+    if _collection_ready:
+        return
     client = _get_client()
     try:
         collections = client.get_collections().collections
         collection_names = [c.name for c in collections]
 
         if ANALYTICS_COLLECTION not in collection_names:
-            # Create collection with minimal vector (we only use payload)
-            client.create_collection(
-                collection_name=ANALYTICS_COLLECTION,
-                vectors_config=VectorParams(size=4, distance=Distance.COSINE),
-            )
+            _create_analytics_collection(client)
             logger.info(f"Created analytics collection: {ANALYTICS_COLLECTION}")
+            _collection_ready = True
 
             # Initialize with empty analytics
             _save_analytics(_get_default_analytics())
+            return
+
+        # Older deployments created this collection with a 4-dim dummy
+        # vector; 1-dim upserts against it would fail on every flush, so
+        # carry the single-point snapshot into a fresh collection once
+        info = client.get_collection(ANALYTICS_COLLECTION)
+        size = getattr(info.config.params.vectors, "size", None)
+        if size is not None and size != 1:
+            results = client.retrieve(
+                collection_name=ANALYTICS_COLLECTION,
+                ids=[ANALYTICS_POINT_ID],
+                with_payload=True,
+            )
+            payload = results[0].payload if results else None
+            client.delete_collection(ANALYTICS_COLLECTION)
+            _create_analytics_collection(client)
+            logger.info(f"Migrated analytics collection to 1-dim dummy vector")
+            _collection_ready = True
+            if payload:
+                data = _get_default_analytics()
+                data.update(payload)
+                _save_analytics(data)
+            return
+
+        _collection_ready = True
     except Exception as e:
         logger.error(f"Error ensuring analytics collection: {e}")
 
@@ -69,7 +179,13 @@ def _get_default_analytics() -> dict:
 
 
 def _load_analytics() -> dict:
-    """Load analytics from Qdrant."""
+    """Load analytics from Qdrant (cached for a few seconds)."""
+    if (
+        _load_cache["data"] is not None
+        and time.monotonic() - _load_cache["t"] < _LOAD_CACHE_TTL_SECONDS
+    ):
+        return _load_cache["data"]
+
     try:
         _ensure_analytics_collection()
         client = _get_client()
@@ -86,9 +202,12 @@ def _load_analytics() -> dict:
             # Merge with defaults to handle missing fields
             defaults = _get_default_analytics()
             defaults.update(payload)
-            return defaults
+        else:
+            defaults = _get_default_analytics()
 
-        return _get_default_analytics()
+        _load_cache["data"] = defaults
+        _load_cache["t"] = time.monotonic()
+        return defaults
 
     except Exception as e:
         logger.error(f"Error loading analytics from Qdrant: {e}")
@@ -107,11 +226,14 @@ def _save_analytics(data: dict):
             points=[
                 PointStruct(
                     id=ANALYTICS_POINT_ID,
-                    vector=[0.0, 0.0, 0.0, 0.0],  # Dummy vector
+                    vector=[0.0],  # Dummy vector (payload is the real data)
                     payload=data,
                 )
             ],
         )
+        # What we just wrote is the freshest copy - refresh the read cache
+        _load_cache["data"] = data
+        _load_cache["t"] = time.monotonic()
     except Exception as e:
         logger.error(f"Error saving analytics to Qdrant: {e}")
 
@@ -122,72 +244,89 @@ def track_query(
     language: str = "en",
     confidence: float = 0.0,
 ):
-    """Track a query for analytics."""
-    try:
-        data = _load_analytics()
-
-        # Increment total
-        data["total_queries"] += 1
+    """Track a query for analytics (in-memory; persisted by the flusher)."""
+    now = datetime.now()
+    with _pending_lock:
+        _pending["total_queries"] += 1
 
-        # Track by regulation
-        for reg in regulations:
-            reg_lower = reg.lower()
-            data["queries_by_regulation"][reg_lower] = (
-                data["queries_by_regulation"].get(reg_lower, 0) + 1
-            )
+        # Track by regulation (one C-level Counter.update call)
+        _pending["queries_by_regulation"].update(_fast_lower(reg) for reg in regulations)
 
         # Track by language
-        data["queries_by_language"][language] = (
-            data["queries_by_language"].get(language, 0) + 1
-        )
+        _pending["queries_by_language"][language] += 1
 
         # Track by date
-        today = datetime.now().strftime("%Y-%m-%d")
-        data["queries_by_date"][today] = (
-            data["queries_by_date"].get(today, 0) + 1
-        )
+        _pending["queries_by_date"][_today_str()] += 1
 
         # Store recent questions (keep last 100)
-        data["recent_questions"].insert(0, {
+        _pending["recent_questions"].appendleft({
             "question": question[:200],  # Truncate long questions
             "regulations": regulations,
             "language": language,
             "confidence": confidence,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
         })
-        data["recent_questions"] = data["recent_questions"][:100]
 
-        _save_analytics(data)
-
-    except Exception as e:
-        logger.error(f"Error tracking query: {e}")
+        if _pending["total_queries"] >= MAX_PENDING_QUERIES:
+            flush_wanted.set()
 
 
 def track_feedback(feedback_type: str):
-    """Track user feedback (positive/negative)."""
+    """Track user feedback (in-memory; persisted by the flusher)."""
+    with _pending_lock:
+        if feedback_type == "yes":
+            _pending["feedback_positive"] += 1
+        elif feedback_type == "no":
+            _pending["feedback_negative"] += 1
+
+
+def flush_analytics() -> Optional[dict]:
+    """Merge pending in-process counters into the persisted analytics.
+
+    Called periodically from the app lifespan and once on shutdown, so a
+    burst of N queries costs one Qdrant round-trip instead of N.
+    Returns the merged state (or None when there was nothing to flush)
+    so callers that need it immediately can skip a re-read.
+    """
+    global _pending
+    with _pending_lock:
+        if (
+            _pending["total_queries"] == 0
+            and _pending["feedback_positive"] == 0
+            and _pending["feedback_negative"] == 0
+        ):
+            return None
+        pending, _pending = _pending, _new_pending()
+
     try:
         data = _load_analytics()
 
-        # Initialize feedback counters if not present
-        if "feedback_positive" not in data:
-            data["feedback_positive"] = 0
-        if "feedback_negative" not in data:
-            data["feedback_negative"] = 0
+        data["total_queries"] += pending["total_queries"]
+        # _load_analytics merges defaults, so the feedback keys always exist
+        data["feedback_positive"] += pending["feedback_positive"]
+        data["feedback_negative"] += pending["feedback_negative"]
 
-        if feedback_type == "yes":
-            data["feedback_positive"] += 1
-        elif feedback_type == "no":
-            data["feedback_negative"] += 1
+        for key in ("queries_by_regulation", "queries_by_language", "queries_by_date"):
+            for name, count in pending[key].items():
+                data[key][name] = data[key].get(name, 0) + count
+
+        merged = deque(data["recent_questions"], maxlen=100)
+        merged.extendleft(reversed(pending["recent_questions"]))
+        data["recent_questions"] = list(merged)
 
         _save_analytics(data)
+        return data
 
     except Exception as e:
-        logger.error(f"Error tracking feedback: {e}")
+        logger.error(f"Error flushing analytics: {e}")
+        return None
 
 
 def get_analytics_summary() -> dict:
     """Get analytics summary."""
-    data = _load_analytics()
+    # Persist anything still buffered so the summary is up to date; the
+    # flush hands back the merged state so we don't re-read it
+    data = flush_analytics() or _load_analytics()
 
     # Calculate some derived stats
     total = data["total_queries"]
@@ -195,18 +334,16 @@ def get_analytics_summary() -> dict:
     by_lang = data["queries_by_language"]
     by_date = data["queries_by_date"]
 
-    # Most popular regulation
-    most_popular_reg = max(by_reg, key=by_reg.get) if by_reg else None
+    # Most popular regulation (itemgetter avoids a dict lookup per entry)
+    most_popular_reg = max(by_reg.items(), key=itemgetter(1))[0] if by_reg else None
 
     # Queries today
-    today = datetime.now().strftime("%Y-%m-%d")
-    queries_today = by_date.get(today, 0)
-
-    # Queries this week (last 7 days)
-    queries_week = 0
-    for i in range(7):
-        day = (datetime.now() - timedelta(days=i)).strftime("%Y-%m-%d")
-        queries_week += by_date.get(day, 0)
+    queries_today = by_date.get(_today_str(), 0)
+
+    # Queries this week (last 7 days) - read the clock once
+    base = date.today()
+    days = [(base - timedelta(days=i)).isoformat() for i in range(7)]
+    queries_week = sum(by_date.get(d, 0) for d in days)
 
     # Feedback stats
     feedback_positive = data.get("feedback_positive", 0)
@@ -0,0 +1,75 @@
+"""SQLite-backed cache of chunk embeddings keyed by content hash.
+
+Re-running a batch ingest only pays the embedding API for chunks whose
+text actually changed; everything else is served locally. Vectors are
+stored as raw float32 bytes so they round-trip through numpy without a
+Python float list in between.
+"""
+import sqlite3
+import threading
+from typing import Optional
+
+import numpy as np
+
+DEFAULT_CACHE_PATH = "embedding_cache.db"
+
+# SQLite caps the number of bound parameters per statement
+_SELECT_BATCH = 500
+
+
+class EmbeddingCache:
+    """Persistent hash -> embedding store shared across ingest runs."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "hash TEXT PRIMARY KEY, model TEXT, dim INTEGER, vec BLOB)"
+        )
+        self._conn.commit()
+
+    def bulk_get(self, hashes: list[str], model: str) -> dict[str, np.ndarray]:
+        """Return {hash: vector} for hashes already cached for `model`."""
+        if not hashes:
+            return {}
+
+        out: dict[str, np.ndarray] = {}
+        with self._lock:
+            for i in range(0, len(hashes), _SELECT_BATCH):
+                batch = hashes[i:i + _SELECT_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT hash, vec FROM cache WHERE model = ? AND hash IN ({placeholders})",
+                    [model, *batch],
+                ).fetchall()
+                for h, vec in rows:
+                    out[h] = np.frombuffer(vec, dtype=np.float32)
+        return out
+
+    def bulk_put(self, hashes: list[str], vectors, model: str):
+        """Store embeddings for the given content hashes."""
+        if not hashes:
+            return
+
+        rows = [
+            (h, model, len(vec), np.asarray(vec, dtype=np.float32).tobytes())
+            for h, vec in zip(hashes, vectors)
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cache (hash, model, dim, vec) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+
+_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get or create the shared embedding cache."""
+    global _cache
+    if _cache is None:
+        _cache = EmbeddingCache()
+    return _cache
@@ -1,5 +1,7 @@
 from openai import OpenAI
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
+import base64
 import numpy as np
 from typing import Union
 
@@ -25,13 +27,37 @@ def get_embedding(text: Union[str, list[str]]) -> np.ndarray:
     if isinstance(text, str):
         text = [text]
 
+    # base64 responses are smaller on the wire and decode straight into
+    # float32 without a Python list of float objects in between
     response = client.embeddings.create(
         model=settings.embedding_model,
-        input=text
+        input=text,
+        encoding_format="base64",
     )
 
-    embeddings = [item.embedding for item in response.data]
-    return np.array(embeddings)
+    out = np.empty((len(response.data), settings.embedding_dim), dtype=np.float32)
+    for i, item in enumerate(response.data):
+        out[i] = np.frombuffer(base64.b64decode(item.embedding), dtype=np.float32)
+
+    # OpenAI embeddings come back unit-length, but renormalize cheaply
+    # so the DOT-distance collection always sees exact unit vectors
+    out /= np.linalg.norm(out, axis=1, keepdims=True) + 1e-12
+    return out
+
+
+def get_embeddings_batched(texts: list[str], batch_size: int = 256) -> np.ndarray:
+    """Embed a large list of texts in parallel API batches.
+
+    The OpenAI client is thread-safe, so the batches are submitted
+    concurrently and the results stacked back in order.
+    """
+    if len(texts) <= batch_size:
+        return get_embedding(texts)
+
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    with ThreadPoolExecutor(max_workers=min(8, len(batches))) as pool:
+        results = list(pool.map(get_embedding, batches))
+    return np.vstack(results)
 
 
 def get_embedding_dimension() -> int:
@@ -6,7 +6,9 @@ from qdrant_client.models import (
     Filter,
     FieldCondition,
     MatchValue,
+    PayloadSchemaType,
 )
+from functools import lru_cache
 from typing import Optional
 import logging
 import re
@@ -25,9 +27,12 @@ def get_qdrant_client() -> QdrantClient:
     global _client
     if _client is None:
         if settings.qdrant_url and settings.qdrant_api_key:
+            # gRPC serializes points via protobuf instead of JSON, which
+            # is much cheaper for large vector payloads
             _client = QdrantClient(
                 url=settings.qdrant_url,
                 api_key=settings.qdrant_api_key,
+                prefer_grpc=True,
             )
         else:
             # Local in-memory for testing
@@ -45,44 +50,120 @@ def ensure_collection_exists():
     if settings.qdrant_collection not in collection_names:
         client.create_collection(
             collection_name=settings.qdrant_collection,
+            # Vectors are L2-normalized client-side, so dot product
+            # ranks identically to cosine without per-op normalization
             vectors_config=VectorParams(
                 size=get_embedding_dimension(),
-                distance=Distance.COSINE,
+                distance=Distance.DOT,
             ),
         )
+        # Payload indexes make the filtered article/regulation lookups
+        # server-side index hits instead of full scans
+        client.create_payload_index(
+            collection_name=settings.qdrant_collection,
+            field_name="article_no",
+            field_schema=PayloadSchemaType.INTEGER,
+        )
+        client.create_payload_index(
+            collection_name=settings.qdrant_collection,
+            field_name="regulation",
+            field_schema=PayloadSchemaType.KEYWORD,
+        )
         logger.info(f"Created collection: {settings.qdrant_collection}")
 
 
+@lru_cache(maxsize=1024)
+def embed_query(text: str) -> tuple:
+    """Embed a query string once; repeats are served from the cache.
+
+    Returns a tuple (hashable, safe to share) so the cached value can't
+    be mutated by callers.
+    """
+    return tuple(get_embedding(text)[0].tolist())
+
+
+def embed_query_batch(texts: list[str]) -> dict:
+    """Embed many query strings in a single API call.
+
+    Returns a mapping of text -> vector tuple; duplicate texts are only
+    embedded once.
+    """
+    unique = [t for t in dict.fromkeys(texts)]
+    if not unique:
+        return {}
+    vectors = get_embedding(unique)
+    return {text: tuple(vector.tolist()) for text, vector in zip(unique, vectors)}
+
+
+# "article 6" / "art. 6" / "GDPR 6" / "article #6" as one alternation,
+# compiled once instead of four patterns tried per query
+_ARTICLE_NUM_RE = re.compile(r'(?:article|art\.?|gdpr)\s*#?\s*(\d+)', re.IGNORECASE)
+
+
 def detect_article_number(query: str) -> Optional[int]:
     """Detect if user is asking about a specific article number."""
-    patterns = [
-        r'article\s*(\d+)',           # "article 6", "Article 6"
-        r'art\.?\s*(\d+)',            # "art 6", "art. 6"
-        r'gdpr\s*(\d+)',              # "GDPR 6", "gdpr 6"
-        r'article\s*#?\s*(\d+)',      # "article #6"
-    ]
-
-    query_lower = query.lower()
-    for pattern in patterns:
-        match = re.search(pattern, query_lower)
-        if match:
-            return int(match.group(1))
+    match = _ARTICLE_NUM_RE.search(query)
+    if match:
+        return int(match.group(1))
     return None
 
 
 def search_regulations(
     query: str,
-    regulations: list[str] = None,
+    regulations: Optional[set[str]] = None,
     k: int = 5,
+    query_vector: Optional[tuple] = None,
 ) -> list[dict]:
-    """Search for relevant regulation chunks."""
+    """Search for relevant regulation chunks.
+
+    `regulations` is expected to be lowercased already (the route handler
+    normalizes it once).
+    """
     client = get_qdrant_client()
 
     # Check if user is asking about a specific article
     article_num = detect_article_number(query)
 
-    # Generate query embedding
-    query_embedding = get_embedding(query)[0].tolist()
+    # Exact-match shortcut: a named article plus a regulation scope is
+    # answered straight from the payload indexes, skipping the embedding
+    # call and the vector search entirely
+    if article_num is not None and regulations:
+        reg_conditions = [
+            FieldCondition(key="regulation", match=MatchValue(value=reg))
+            for reg in sorted(regulations)
+        ]
+        exact_filter = Filter(must=[
+            FieldCondition(key="article_no", match=MatchValue(value=article_num)),
+            reg_conditions[0] if len(reg_conditions) == 1 else Filter(should=reg_conditions),
+        ])
+        try:
+            points, _ = client.scroll(
+                collection_name=settings.qdrant_collection,
+                scroll_filter=exact_filter,
+                limit=k,
+                with_payload=True,
+            )
+        except Exception as e:
+            logger.error(f"Exact article lookup error: {e}")
+            points = []
+        if points:
+            # scroll returns point-ID order (effectively random for
+            # hashed IDs); restore the article's reading order
+            points.sort(key=lambda p: (p.payload or {}).get("chunk_index") or 0)
+            return [
+                {
+                    "content": (p.payload or {}).get("content", ""),
+                    "regulation": (p.payload or {}).get("regulation", "unknown"),
+                    "article_no": (p.payload or {}).get("article_no"),
+                    "title": (p.payload or {}).get("title", ""),
+                    "url": (p.payload or {}).get("url", ""),
+                    "score": 0.9,  # Exact article match
+                }
+                for p in points
+            ]
+
+    # Generate query embedding (unless the caller already has one)
+    query_embedding = list(query_vector) if query_vector is not None else list(embed_query(query))
 
     # Build filter if regulations specified
     search_filter = None
@@ -135,23 +216,28 @@ def search_regulations(
                 c["score"] = min(c["score"] + 0.3, 1.0)
             chunks = matching + non_matching
         else:
-            # Article not in results, search all data for it
+            # Article not in results; query it directly through the
+            # article_no payload index instead of scanning a scroll page
             try:
-                all_results = client.scroll(
+                article_results = client.query_points(
                     collection_name=settings.qdrant_collection,
-                    limit=100,
+                    query=query_embedding,
+                    query_filter=Filter(must=[
+                        FieldCondition(key="article_no", match=MatchValue(value=article_num))
+                    ]),
+                    limit=k,
                     with_payload=True,
                 )
-                for point in all_results[0]:
-                    if point.payload.get("article_no") == article_num:
-                        chunks.insert(0, {
-                            "content": point.payload.get("content", ""),
-                            "regulation": point.payload.get("regulation", "unknown"),
-                            "article_no": point.payload.get("article_no"),
-                            "title": point.payload.get("title", ""),
-                            "url": point.payload.get("url", ""),
-                            "score": 0.9,  # High score for exact match
-                        })
+                for point in article_results.points:
+                    payload = point.payload or {}
+                    chunks.insert(0, {
+                        "content": payload.get("content", ""),
+                        "regulation": payload.get("regulation", "unknown"),
+                        "article_no": payload.get("article_no"),
+                        "title": payload.get("title", ""),
+                        "url": payload.get("url", ""),
+                        "score": 0.9,  # High score for exact match
+                    })
             except Exception as e:
                 logger.error(f"Article search error: {e}")
 
@@ -1,7 +1,11 @@
 from openai import OpenAI
 from groq import Groq
 from typing import Optional
+from collections import OrderedDict
+import hashlib
 import logging
+import threading
+import time
 
 from config import get_settings
 from models import Citation
@@ -9,6 +13,39 @@ from models import Citation
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# Memoized LLM answers: a repeated question over the same retrieved
+# chunks costs a dict lookup instead of another LLM round-trip
+_SYNTH_CACHE_MAX = 512
+_SYNTH_CACHE_TTL_SECONDS = 3600.0
+_synth_cache: OrderedDict = OrderedDict()
+_synth_cache_lock = threading.Lock()
+
+
+def _synth_cache_key(question: str, chunks: list[dict], language: str, mode: str) -> str:
+    raw = "|".join((question, language, mode, *(c["content"][:64] for c in chunks)))
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def _synth_cache_get(key: str):
+    with _synth_cache_lock:
+        entry = _synth_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if time.monotonic() >= expires_at:
+            del _synth_cache[key]
+            return None
+        _synth_cache.move_to_end(key)
+        return result
+
+
+def _synth_cache_put(key: str, result):
+    with _synth_cache_lock:
+        _synth_cache[key] = (time.monotonic() + _SYNTH_CACHE_TTL_SECONDS, result)
+        _synth_cache.move_to_end(key)
+        while len(_synth_cache) > _SYNTH_CACHE_MAX:
+            _synth_cache.popitem(last=False)
+
 _openai_client: Optional[OpenAI] = None
 _groq_client: Optional[Groq] = None
 
@@ -29,72 +66,171 @@ def get_groq_client() -> Groq:
     return _groq_client
 
 
-def synthesize_answer(
+# Byte-identical across all requests so provider-side prompt-prefix
+# caching applies; language and answer-length instructions travel in
+# the user message instead
+_SYSTEM_PROMPT = """You are ERSE (European Regulatory Source Engine), an expert assistant on EU regulations.
+Your task is to answer questions based ONLY on the provided regulatory sources.
+
+Guidelines:
+- Always cite specific articles when referencing information (e.g., "According to GDPR Article 7...")
+- If the sources don't contain enough information, say so clearly
+- Be precise and factual - this is legal/regulatory information
+- Do not make up information not in the sources"""
+
+# Token budget for the context block of the prompt; chunks beyond it
+# are dropped (input tokens translate directly into LLM latency/cost)
+_CONTEXT_TOKEN_BUDGET = 3000
+
+_encoding = None
+_encoding_loaded = False
+
+
+def _get_encoding():
+    """Get or create the tokenizer (None when tiktoken is unavailable)."""
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            logger.warning("tiktoken unavailable; using character-based token estimate")
+    return _encoding
+
+
+def _count_tokens(text: str) -> int:
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    # Rough heuristic: ~4 chars per token for English/legal text
+    return len(text) // 4
+
+
+def _build_prompts(
     question: str,
     chunks: list[dict],
-    language: str = "en",
-    mode: str = "detailed",
-) -> tuple[str, list[Citation], float]:
-    """Generate an answer using retrieved chunks."""
+    language: str,
+    mode: str,
+) -> tuple[str, str]:
+    """Build the (system, user) prompts for a synthesis request.
 
-    if not chunks:
-        return "I couldn't find relevant information to answer your question.", [], 0.0
-
-    # Build context from chunks
+    The context block is capped by token budget rather than chunk count,
+    and near-identical chunks are skipped, so the prompt stays within a
+    predictable input-token cost.
+    """
     context_parts = []
-    for i, chunk in enumerate(chunks, 1):
+    seen_prefixes = set()
+    budget = _CONTEXT_TOKEN_BUDGET
+    source_no = 0
+    for chunk in chunks:
+        # Near-duplicates (same leading text) add tokens, not information
+        prefix = chunk['content'][:200]
+        if prefix in seen_prefixes:
+            continue
+        seen_prefixes.add(prefix)
+
+        source_no += 1
         article_info = f"Article {chunk['article_no']}" if chunk.get('article_no') else "Section"
-        context_parts.append(
-            f"[Source {i}] {chunk['regulation'].upper()} - {article_info}: {chunk.get('title', '')}\n"
+        part = (
+            f"[Source {source_no}] {chunk['regulation'].upper()} - {article_info}: {chunk.get('title', '')}\n"
             f"{chunk['content']}\n"
         )
 
+        cost = _count_tokens(part)
+        if cost > budget:
+            encoding = _get_encoding()
+            if not context_parts and encoding is not None:
+                # Keep at least one (trimmed) source
+                context_parts.append(encoding.decode(encoding.encode(part)[:budget]))
+            break
+        budget -= cost
+        context_parts.append(part)
+
     context = "\n---\n".join(context_parts)
 
-    # Build prompt
     length_instruction = "Be concise (2-3 paragraphs max)." if mode == "short" else "Provide a comprehensive answer."
 
-    system_prompt = f"""You are ERSE (European Regulatory Source Engine), an expert assistant on EU regulations.
-Your task is to answer questions based ONLY on the provided regulatory sources.
-
-Guidelines:
-- Answer in {language}
-- {length_instruction}
-- Always cite specific articles when referencing information (e.g., "According to GDPR Article 7...")
-- If the sources don't contain enough information, say so clearly
-- Be precise and factual - this is legal/regulatory information
-- Do not make up information not in the sources"""
-
     user_prompt = f"""Question: {question}
 
 Relevant Regulatory Sources:
 {context}
 
-Please provide an accurate answer based on these sources."""
+Please provide an accurate answer based on these sources.
+Answer in {language}. {length_instruction}"""
+
+    return _SYSTEM_PROMPT, user_prompt
+
+
+def _get_llm_client():
+    """Return the configured chat-completions client."""
+    if settings.llm_provider == "openai":
+        return get_openai_client()
+    return get_groq_client()
+
+
+def synthesize_answer_stream(
+    question: str,
+    chunks: list[dict],
+    language: str = "en",
+    mode: str = "detailed",
+):
+    """Stream an answer's text as it is generated.
+
+    Yields content deltas so callers can render tokens as they arrive
+    instead of waiting for the full generation; citations and confidence
+    are not part of the stream (use synthesize_answer for those).
+    """
+    system_prompt, user_prompt = _build_prompts(question, chunks, language, mode)
+
+    try:
+        response = _get_llm_client().chat.completions.create(
+            model=settings.llm_model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            temperature=0.3,
+            max_tokens=1500 if mode == "detailed" else 500,
+            stream=True,
+        )
+        for event in response:
+            if event.choices and event.choices[0].delta.content:
+                yield event.choices[0].delta.content
+    except Exception as e:
+        logger.error(f"LLM API error: {e}")
+        yield f"Error generating answer: {str(e)}"
+
+
+def synthesize_answer(
+    question: str,
+    chunks: list[dict],
+    language: str = "en",
+    mode: str = "detailed",
+) -> tuple[str, list[Citation], float]:
+    """Generate an answer using retrieved chunks."""
+
+    if not chunks:
+        return "I couldn't find relevant information to answer your question.", [], 0.0
+
+    cache_key = _synth_cache_key(question, chunks, language, mode)
+    cached = _synth_cache_get(cache_key)
+    if cached is not None:
+        answer, citations, confidence = cached
+        return answer, list(citations), confidence
+
+    system_prompt, user_prompt = _build_prompts(question, chunks, language, mode)
 
     try:
-        if settings.llm_provider == "openai":
-            client = get_openai_client()
-            response = client.chat.completions.create(
-                model=settings.llm_model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-                temperature=0.3,
-                max_tokens=1500 if mode == "detailed" else 500,
-            )
-        else:
-            client = get_groq_client()
-            response = client.chat.completions.create(
-                model=settings.llm_model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-                temperature=0.3,
-                max_tokens=1500 if mode == "detailed" else 500,
-            )
+        response = _get_llm_client().chat.completions.create(
+            model=settings.llm_model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            temperature=0.3,
+            max_tokens=1500 if mode == "detailed" else 500,
+        )
 
         answer = response.choices[0].message.content
 
@@ -118,4 +254,9 @@ Please provide an accurate answer based on these sources."""
     avg_score = sum(c.relevance_score for c in citations) / len(citations) if citations else 0
     confidence = min(avg_score * 1.2, 1.0)  # Scale up slightly, cap at 1.0
 
+    # Don't memoize near-zero-confidence answers; a better index state
+    # or rephrased question should get a fresh attempt
+    if confidence > 0.05:
+        _synth_cache_put(cache_key, (answer, citations, confidence))
+
     return answer, citations, confidence